@@ -0,0 +1,17 @@
+"""Definition of command line argument and option types"""
+
+from enum import Enum
+
+import typer
+from constants import DEPTHAI, WEBCAM
+
+# Argument and Option types
+TYPES = Enum("DevicePath", {"all": "all", WEBCAM: WEBCAM, DEPTHAI: DEPTHAI})
+TypeArgument = typer.Option(default=WEBCAM, help=f"Choose camera type")
+DevicePathWebcam = typer.Argument(
+    default=..., help="Path to real camera device, e.g. /dev/video0."
+)
+DevicePathDepthai = typer.Argument(
+    default=...,
+    help="Path (mxid) to real camera device, e.g. 14442C1021C694D000.",
+)
@@ -1,9 +1,9 @@
-"""Definition of constants and types"""
+"""Definition of constants and types.
 
-from enum import Enum
-from typing import NewType
+Command line argument and option types are defined in cli_types.py.
+"""
 
-import typer
+from typing import NewType
 
 # Definition of maximum image size for virtual camera.
 # Higher resolutions are usually not supported on online meeting tools
@@ -11,18 +11,11 @@ import typer
 MAX_WIDTH = 1280
 MAX_HEIGHT = 720
 
+# Lifetime (seconds) of cached camera device enumeration results.
+# Enumeration opens every /dev/video* node, so results are reused for a short time.
+ENUM_CACHE_TTL = 2.0
+
 # Plugin types (avoid spelling errors with explicit type)
 PluginType = NewType("PluginType", str)
 DEPTHAI = PluginType("depthai")
 WEBCAM = PluginType("webcam")
-
-# Argument and Option types
-TYPES = Enum("DevicePath", {"all": "all", WEBCAM: WEBCAM, DEPTHAI: DEPTHAI})
-TypeArgument = typer.Option(default=WEBCAM, help=f"Choose camera type")
-DevicePathWebcam = typer.Argument(
-    default=..., help="Path to real camera device, e.g. /dev/video0."
-)
-DevicePathDepthai = typer.Argument(
-    default=...,
-    help="Path (mxid) to real camera device, e.g. 14442C1021C694D000.",
-)
@@ -0,0 +1,73 @@
+"""This file contains the depthai capture class, it is kept apart from utils.py so that webcam usage does not load depthai."""
+
+from types import MethodType
+from typing import Any, Callable
+
+import depthai
+from constants import MAX_HEIGHT, MAX_WIDTH
+from numpy.typing import NDArray
+from typing_extensions import Self
+from utils import ImageHandler
+
+
+class DepthaiCapture(depthai.Device):
+    """Handle video capture functionalities with depthai.
+
+    Inherits from depthai.Device and extends functionalities with
+    methods to safely enter, exit, get frames and frame rates from
+    a depthai device.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the depthai.Device object and assign width and height properties."""
+        super().__init__(*args, **kwargs)
+        self.width = MAX_WIDTH
+        self.height = MAX_HEIGHT
+        self.img_handler = ImageHandler()
+        # set while the device may still be read from another thread, it is released at exit then
+        self.keep_open = False
+
+    def __enter__(self) -> Self:
+        """Enter method for context management, returning self."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Exit method for context management, releasing the video capture object unless it is kept open."""
+        if not self.keep_open:
+            self.close()
+
+    def get_frame(self) -> NDArray[Any]:
+        """
+        Capture a frame from the video stream.
+
+        Returns:
+            A frame and potentially detections which has been captured by the camera.
+        """
+        # get image and detections from depthai plugin (image acquisition function)
+        img, det = self.acquisition()
+
+        # high image resolution is usually not supported by online meeting tools
+        img = self.img_handler.correct_img_size(img)
+
+        return img, det
+
+    def setup(self, setup_func: Callable, acquisition_func: Callable):
+        """Setup initializations defined in the plugins setup function and create an acquisition function also based on plugin specification.
+
+        Args:
+            setup_func --- initialization function of plugin
+            acquisition_func --- handling function for image acquisition of plugin
+        """
+        setup_func(self)
+        self.acquisition = MethodType(acquisition_func, self)
+
+    def get_fps(self) -> int:
+        """Retrieve the frames per second (FPS) of the video capture.
+
+        Prints the total FPS and returns the FPS as an integer.
+        """
+
+        # fps =
+        # print(f"total FPS: {int(fps)}")
+        # return int(fps)
+        raise NotImplementedError
@@ -1,52 +1,149 @@
 """This file facilitates the management and utilization of virtual and real camera devices."""
 
+import fcntl
+import os
 import re
-import signal
+import struct
 import sys
+import time
 from enum import Enum
-from pathlib import Path
-from types import FrameType
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional
 
-import depthai
-from constants import DEPTHAI, WEBCAM, PluginType
+from constants import DEPTHAI, ENUM_CACHE_TTL, WEBCAM, PluginType
 from print import Printer
-from utils import DepthaiCapture, VideoCapture
-from v4l2ctl import V4l2Capabilities, V4l2Device
+from utils import VideoCapture
+from v4l2ctl import V4l2Capabilities
 
+if TYPE_CHECKING:
+    from depthai_capture import DepthaiCapture
 
-class V4l2Capture(V4l2Device):
-    """Handle real camera devices.
+try:
+    # optional, allows to enumerate devices from udev without opening device files
+    import pyudev
+except ImportError:
+    pyudev = None
 
-    Inherits from v4l2ctl.V4l2Device and extends functionalities with
-    methods to safely enter and exit.
+# first number in a virtual camera label, which is the id of the real webcam
+_DIGIT_RE = re.compile(r"\d+")
+# mxid of a depthai device within the label of its virtual counterpart
+_MXID_RE = re.compile(r"MeetingCam(\w+)")
+# interned prefixes, shared by all device paths and bus checks
+_VIDEO_PREFIX = sys.intern("/dev/video")
+_VIDEO_PREFIX_LEN = len(_VIDEO_PREFIX)
+_BUS_VIRTUAL = sys.intern("platform:v4l2loopback")
+
+# struct v4l2_capability: driver, card, bus_info, version, capabilities, device_caps, reserved[3]
+_V4L2_CAPABILITY = struct.Struct("<16s32s32sIII3I")
+# _IOR('V', 0, struct v4l2_capability)
+_VIDIOC_QUERYCAP = 0x80685600
+
+
+class DeviceRecord(NamedTuple):
+    """Enumerated camera device."""
+
+    path: str
+    label: str
+    virtual: bool
+
+
+def _video_nodes() -> list[os.DirEntry]:
+    """Return the video device nodes in /dev, sorted by their number."""
+    with os.scandir("/dev") as entries:
+        nodes = [
+            entry
+            for entry in entries
+            if entry.name.startswith("video") and entry.name[5:].isdigit()
+        ]
+    nodes.sort(key=lambda entry: int(entry.name[5:]))
+    return nodes
+
+
+def _dev_signature() -> int:
+    """Return a checksum of the video device nodes in /dev.
+
+    The checksum changes whenever a video device node is added, removed or recreated.
     """
+    nodes = []
+    for entry in _video_nodes():
+        stat = entry.stat(follow_symlinks=False)
+        nodes.append((entry.name, stat.st_ino, stat.st_rdev))
+    return hash(tuple(nodes))
 
-    def __enter__(self) -> V4l2Device:
-        """Enter method for context management, returning self."""
-        return self
 
-    def __exit__(self, *args: tuple[Any]) -> None:
-        """Exit method for context management, releasing the devices."""
-        self.flush()
-        self.close()
+def _query_cap(device_path: str) -> tuple[str, str, int] | None:
+    """Query a video device node with a single VIDIOC_QUERYCAP ioctl.
+
+    Args:
+        device_path --- the path of the video device node.
+
+    Returns:
+        A tuple containing card name, bus info and capabilities of the node, None if the node can't be queried.
+    """
+    try:
+        fd = os.open(device_path, os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return None
+    try:
+        buffer = bytearray(_V4L2_CAPABILITY.size)
+        fcntl.ioctl(fd, _VIDIOC_QUERYCAP, buffer)
+    except OSError:
+        # not a v4l2 device
+        return None
+    finally:
+        os.close(fd)
+
+    _, card, bus, _, capabilities, device_caps, *_ = _V4L2_CAPABILITY.unpack(
+        buffer
+    )
+    # use the capabilities of this node, not of the whole physical device
+    if capabilities & V4l2Capabilities.DEVICE_CAPS:
+        capabilities = device_caps
+    return (
+        card.split(b"\0", 1)[0].decode(errors="replace"),
+        bus.split(b"\0", 1)[0].decode(errors="replace"),
+        capabilities,
+    )
+
+
+def _udev_bus(device: "pyudev.Device") -> str | None:
+    """Derive the bus info of a video device node from its udev path.
+
+    Args:
+        device --- the udev device of the video device node.
+
+    Returns:
+        The bus info in QUERYCAP notation, e.g. platform:v4l2loopback.0 for a virtual device, None if udev has no path for the node.
+    """
+    path = device.properties.get("ID_PATH")
+    if not path:
+        return None
+    # e.g. platform-v4l2loopback.0 or pci-0000:00:14.0-usb-0:1:1.0
+    return path.replace("-", ":", 1)
 
 
 class DeviceHandler:
     """Base class for management and mapping of real and virtual devices."""
 
-    def __init__(self) -> None:
-        """Initialize the DeviceHandler by setting up necessary mappings and signal handler."""
-        signal.signal(signal.SIGINT, self._interrupt)
+    # enumeration caches below are class attributes shared by all instances, not slots
+    __slots__ = (
+        "type",
+        "real_path",
+        "available_devices_real",
+        "available_devices_virtual",
+        "mapping",
+        "pprint",
+        "_real_to_virtual",
+    )
+
+    # enumeration results shared by all handlers of this process
+    # (timestamp, video node signature, device records)
+    _enum_cache: tuple[float, int, list[DeviceRecord]] | None = None
 
+    def __init__(self) -> None:
+        """Initialize the DeviceHandler by setting up necessary mappings."""
         self.mapping = self.device_mapping()
         self.pprint = Printer()
 
-    def _interrupt(self, signal: int, frame: FrameType | None) -> None:
-        """Handle SIGINT signal by stopping the device and exiting the program."""
-        self.pprint.device_stopped()
-        sys.exit(0)
-
     def init_device(self, device_path: str | None) -> str:
         """Initialize the device by analyzing the device path and mapping it a virtual device.
 
@@ -56,13 +153,10 @@ class DeviceHandler:
         Returns:
             A a string containing the path to the virtual device.
         """
-        device_map = {
-            device["path_real"]: device["path_virtual"]
-            for device in self.mapping.values()
-        }
+        device_map = self._real_to_virtual
         if device_path:
             # device is specified as argument in command line
-            if device_path in device_map.keys():
+            if device_path in device_map:
                 # check if specified device is available in real devices and has virtual counterpart
                 self.real_path = device_path
                 virtual_path = device_map[device_path]
@@ -86,46 +180,58 @@ class DeviceHandler:
 
         Returns:
             A dictionary that contains information about real and virtual devices.
+
+        The real to virtual device path lookup of init_device is built in the same pass.
         """
 
         device_map = {}
+        self._real_to_virtual = {}
 
         (paths_real, labels_real) = self.available_devices_real
         (paths_virtual, labels_virtual) = self.available_devices_virtual
 
+        if not paths_real or not paths_virtual:
+            # nothing to map, e.g. no virtual devices added yet
+            return device_map
+
+        # pairs of (real index, virtual index) of mapped devices
+        mapping_indices = []
+
         # extract the IDs (first number in virtual camera label) of available virtual cameras for mapping it to real cameras
         # the mapping index is same as real cameras path id. e.g. /dev/video_n_ with n as id
         if self.type == WEBCAM:
-            mapping_ids = [
-                int(re.findall(r"\d+", label)[0]) for label in labels_virtual
-            ]
-            ids_real = [
-                int(path.replace("/dev/video", "")) for path in paths_real
-            ]
-
-            try:
-                mapping_indices = [ids_real.index(id) for id in mapping_ids]
-            except:
-                mapping_indices = {}
+            real_by_id = {
+                int(path[_VIDEO_PREFIX_LEN:]): i
+                for i, path in enumerate(paths_real)
+            }
+            for j, label in enumerate(labels_virtual):
+                match = _DIGIT_RE.search(label)
+                if match and int(match.group()) in real_by_id:
+                    mapping_indices.append((real_by_id[int(match.group())], j))
 
         elif self.type == DEPTHAI:
-            mapping_indices = []
+            # the mxid of the real device is embedded in the virtual camera label, e.g. MeetingCam_mxid_ OAK Device
+            virtual_by_mxid = {}
+            for j, label in enumerate(labels_virtual):
+                match = _MXID_RE.match(label)
+                if match:
+                    virtual_by_mxid.setdefault(match.group(1), j)
             for i, mxid in enumerate(paths_real):
-                for j, label in enumerate(labels_virtual):
-                    if mxid in label:
-                        mapping_indices.append(j)
+                if mxid in virtual_by_mxid:
+                    mapping_indices.append((i, virtual_by_mxid[mxid]))
         else:
             raise NotImplementedError(
                 "Device type needs to be either 'webcam' or 'depthai'."
             )
 
-        for i, j in enumerate(mapping_indices):
-            device_map[i] = {
-                "path_real": paths_real[j],
-                "label_real": labels_real[j],
-                "path_virtual": paths_virtual[i],
-                "label_virtual": labels_virtual[i],
+        for n, (i, j) in enumerate(mapping_indices):
+            device_map[n] = {
+                "path_real": paths_real[i],
+                "label_real": labels_real[i],
+                "path_virtual": paths_virtual[j],
+                "label_virtual": labels_virtual[j],
             }
+            self._real_to_virtual[paths_real[i]] = paths_virtual[j]
 
         return device_map
 
@@ -138,75 +244,158 @@ class DeviceHandler:
         Returns:
             A tuple containing lists of device paths and labels.
         """
+        available_real, available_virtual = self.get_available_all()
+        return available_real if real else available_virtual
 
-        device_paths = []
-        labels = []
+    def get_available_all(
+        self,
+    ) -> tuple[tuple[list[str], list[str]], tuple[list[str], list[str]]]:
+        """Return available real and virtual camera devices from a single device walk.
 
-        with V4l2Capture() as v4l2:
-            for device in v4l2.iter_devices(skip_links=True):
-                if (
-                    real
-                    and not self._is_virtual_device(device)
-                    and V4l2Capabilities.VIDEO_CAPTURE in device.capabilities
-                ):
-                    device_path, label = self._get_device_info(device)
-                elif (
-                    not real
-                    and self._is_virtual_device(device)
-                    and V4l2Capabilities.VIDEO_OUTPUT in device.capabilities
-                ):
-                    device_path, label = self._get_device_info(device)
-                else:
+        Returns:
+            A tuple containing the (paths, labels) tuples of real and of virtual devices.
+        """
+        available_real = ([], [])
+        available_virtual = ([], [])
+
+        for device in self._enumerate():
+            device_paths, labels = (
+                available_virtual if device.virtual else available_real
+            )
+            labels.append(device.label)
+            device_paths.append(device.path)
+
+        return available_real, available_virtual
+
+    def _enumerate(self) -> list[DeviceRecord]:
+        """Enumerate real and virtual camera devices in a single pass.
+
+        Results are cached for ENUM_CACHE_TTL seconds, as long as no video device node is added, removed or replaced.
+
+        Returns:
+            A list of records of all camera devices.
+        """
+        signature = _dev_signature()
+        if self._enum_cache:
+            timestamp, cached_signature, devices = self._enum_cache
+            if (
+                time.monotonic() - timestamp < ENUM_CACHE_TTL
+                and cached_signature == signature
+            ):
+                return devices
+
+        devices = self._enumerate_udev() if pyudev else None
+        if devices is None:
+            devices = list(self._iter_querycap())
+
+        DeviceHandler._enum_cache = (time.monotonic(), signature, devices)
+        return devices
+
+    def _iter_querycap(self) -> Iterator[DeviceRecord]:
+        """Iterate over camera devices by querying the capabilities of each video device node.
+
+        Yields:
+            Records of real capture and virtual output devices.
+        """
+        for entry in _video_nodes():
+            if entry.is_symlink():
+                # links point to nodes which are listed anyway
+                continue
+            device_path = entry.path
+            cap = _query_cap(device_path)
+            if cap is None:
+                continue
+            label, bus, capabilities = cap
+            virtual = self._is_virtual_device(bus)
+            # real devices need to capture, virtual devices need to output video
+            capability = (
+                V4l2Capabilities.VIDEO_OUTPUT
+                if virtual
+                else V4l2Capabilities.VIDEO_CAPTURE
+            )
+            if capabilities & capability:
+                yield DeviceRecord(sys.intern(device_path), label, virtual)
+
+    def _enumerate_udev(self) -> list[DeviceRecord] | None:
+        """Enumerate camera devices from udev metadata, opening only device files udev has no path for.
+
+        Returns:
+            A list of records of real capture and virtual output devices,
+            None if udev did not probe the devices.
+        """
+        devices = []
+
+        for device in pyudev.Context().list_devices(subsystem="video4linux"):
+            device_path = device.device_node
+            # only /dev/videoN nodes, the number is the webcam id
+            if (
+                not device_path
+                or not device_path.startswith(_VIDEO_PREFIX)
+                or not device_path[_VIDEO_PREFIX_LEN:].isdigit()
+            ):
+                continue
+            # same criterion as for QUERYCAP, udev's path of the node corresponds to its bus info
+            bus = _udev_bus(device)
+            if bus is None:
+                # e.g. nodes without a parent device, only their QUERYCAP bus info tells
+                cap = _query_cap(device_path)
+                if cap is None:
                     continue
+                bus = cap[1]
+            virtual = self._is_virtual_device(bus)
+            capabilities = device.properties.get("ID_V4L_CAPABILITIES")
+            if capabilities is None:
+                # e.g. in containers without udev rules, fall back to QUERYCAP
+                return None
+            capability = ":video_output:" if virtual else ":capture:"
+            if capability not in capabilities:
+                continue
+
+            label = device.properties.get("ID_V4L_PRODUCT")
+            if not label:
+                label = device.attributes.asstring("name")
+            devices.append(
+                DeviceRecord(sys.intern(device_path), label, virtual)
+            )
 
-                labels.append(label)
-                device_paths.append(device_path)
+        return devices
 
-        return device_paths, labels
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop cached enumeration results, the next enumeration scans the devices again."""
+        DeviceHandler._enum_cache = None
+
+    def refresh(self) -> None:
+        """Drop cached enumeration results and update available devices and mapping."""
+        self.invalidate()
+        self.update_available()
+        self.mapping = self.device_mapping()
 
     def device_running(self) -> None:
         """Print the running device."""
         self.pprint.device_running()
 
-    def _is_virtual_device(self, device: V4l2Device) -> bool:
+    def device_stopped(self) -> None:
+        """Print the stopped device."""
+        self.pprint.device_stopped()
+
+    def _is_virtual_device(self, bus: str) -> bool:
         """Check if the device is a virtual device.
 
         Args:
-            device (V4l2Device) --- the device to check.
+            bus --- the bus info of the device, e.g. platform:v4l2loopback-000 for a virtual device.
 
         Returns:
             True if the device is virtual, False otherwise.
         """
-        virtual = True if "platform:v4l2loopback" in str(device.bus) else False
-        return virtual
-
-    def _get_device_info(self, device: V4l2Device) -> tuple[str, str]:
-        """Extract and return device information including path and label.
-
-        Args:
-            device (V4l2Device) --- the device to extract information from.
-
-        Returns:
-            A tuple containing the device path (str) and label (str).
-
-        Raises:
-            AssertionError: If the device path does not follow the expected format or does not exist.
-        """
-        device_path = str(device.device)
-        card_label = str(device.name)
-
-        assert device_path.__contains__(
-            "/dev/video"
-        ), "Device name '{device_name}' should be of format '/dev/video_n_'."
-        assert Path(
-            device_path
-        ).exists(), "Device path '{device_name}' does not exist."
-        return device_path, card_label
+        return bus.startswith(_BUS_VIRTUAL)
 
 
 class WebcamDevice(DeviceHandler):
     """Handles the management and mapping of real and virtual webcam devices."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         """Initialize the WebcamDevice class."""
 
@@ -238,16 +427,28 @@ class WebcamDevice(DeviceHandler):
 
     def update_available(self) -> None:
         """Update the list of available real and virtual devices."""
-        self.available_devices_real = self.get_available(real=True)
-        self.available_devices_virtual = self.get_available(real=False)
+        (
+            self.available_devices_real,
+            self.available_devices_virtual,
+        ) = self.get_available_all()
 
 
 class DepthaiDevice(DeviceHandler):
     """Handles the management and mapping of depthai and virtual devices."""
 
+    __slots__ = ("_depthai", "usb_speed", "device_info", "pipeline")
+
+    # depthai enumeration (USB scan) shared by all handlers of this process
+    # (timestamp, (mxids, labels))
+    _depthai_cache: tuple[float, tuple[list[str], list[str]]] | None = None
+
     def __init__(self, pipeline) -> None:
         """Initialize the DepthaiDevice class."""
 
+        # depthai is imported on demand, webcam usage does not need to load it
+        import depthai
+
+        self._depthai = depthai
         self.type = DEPTHAI
         self.real_path = None
         self.available_devices_real = None
@@ -256,11 +457,11 @@ class DepthaiDevice(DeviceHandler):
         self.update_available()
         super().__init__()
 
-        self.usb_speed = depthai.UsbSpeed.SUPER_PLUS
+        self.usb_speed = self._depthai.UsbSpeed.SUPER_PLUS
         self.device_info = None
         self.pipeline = pipeline
 
-    def get_device(self) -> DepthaiCapture:
+    def get_device(self) -> "DepthaiCapture":
         """Get a DepthaiCapture class instance can be used for depthai image acquisition.
 
         Raises:
@@ -270,7 +471,9 @@ class DepthaiDevice(DeviceHandler):
             A DepthaiCapture class instance.
         """
         if self.real_path:
-            self.device_info = depthai.DeviceInfo(self.real_path)
+            from depthai_capture import DepthaiCapture
+
+            self.device_info = self._depthai.DeviceInfo(self.real_path)
             return DepthaiCapture(
                 pipeline=self.pipeline,
                 deviceInfo=self.device_info,
@@ -288,6 +491,12 @@ class DepthaiDevice(DeviceHandler):
         self.available_devices_real = self.get_available_depthai()
         self.available_devices_virtual = self.get_available(real=False)
 
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop cached depthai and v4l2 enumeration results."""
+        DepthaiDevice._depthai_cache = None
+        super().invalidate()
+
     def get_available_depthai(
         self,
     ) -> tuple[list[str], list[str],]:
@@ -295,16 +504,27 @@ class DepthaiDevice(DeviceHandler):
 
         Returns:
             Device paths and labels.
+
+        Results are cached for ENUM_CACHE_TTL seconds, the USB scan of depthai is slow.
         """
+        if self._depthai_cache:
+            timestamp, available = self._depthai_cache
+            if time.monotonic() - timestamp < ENUM_CACHE_TTL:
+                return available
+
         device_paths = []
         labels = []
 
-        device_info = depthai.Device.getAllAvailableDevices()
+        device_info = self._depthai.Device.getAllAvailableDevices()
 
         for device in device_info:
             labels.append(f"OAK Device on port {device.name}")
             device_paths.append(device.mxid)
 
+        DepthaiDevice._depthai_cache = (
+            time.monotonic(),
+            (device_paths, labels),
+        )
         return device_paths, labels
 
 
@@ -6,12 +6,15 @@ MeetingCam allows to manage and modify video streams and route them to web meeti
 
 import shutil
 import sys
+from functools import wraps
 from pathlib import Path
+from string import Template
+from typing import Any, Callable
 
 import typer
-from constants import DEPTHAI, TYPES, WEBCAM, TypeArgument
+from cli_types import TYPES, TypeArgument
+from constants import DEPTHAI, WEBCAM
 from device import DepthaiDevice, WebcamDevice
-from jinja2 import Environment, FileSystemLoader
 from plugins.plugin_utils import PluginRegistry
 from print import Printer
 
@@ -19,7 +22,6 @@ app = typer.Typer(add_completion=False)
 
 registry = PluginRegistry()
 plugin_list = registry.search_plugins()
-registry.register_plugins(app, plugin_list)
 
 printer = Printer()
 
@@ -182,9 +184,9 @@ def create_plugin(
     path.mkdir(parents=True, exist_ok=True)
     template_path = Path("src/meetingcam/plugins/plugin_template.py")
 
-    env = Environment(loader=FileSystemLoader(template_path.parent.as_posix()))
-    template = env.get_template(template_path.name)
-    output = template.render(
+    # the template only has plain placeholders, e.g. $name
+    template = Template(template_path.read_text())
+    output = template.substitute(
         name=name, short_description=short_description, description=description
     )
 
@@ -221,5 +223,43 @@ def delete_plugin(
         typer.echo(f"Plugin {name} deleted successfully.")
 
 
+def stop_on_interrupt(callback: Callable[..., Any]) -> Callable[..., Any]:
+    """Print the stop message instead of a bare "Aborted!" if a plugin command is interrupted, e.g. while loading its model.
+
+    Args:
+        callback --- the command callback to wrap.
+
+    Returns:
+        The wrapped callback, with the signature of the original one for typer.
+    """
+
+    @wraps(callback)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return callback(*args, **kwargs)
+        except KeyboardInterrupt:
+            printer.device_stopped()
+            sys.exit(0)
+
+    return wrapper
+
+
 if __name__ == "__main__":
-    app()
+    try:
+        # plugins are imported only if one of them can be invoked, general commands don't need them
+        # a plugin command imports only its own plugin, the help lists all of them
+        if not registry.invokes_command(app, sys.argv[1:]):
+            registry.register_plugins(
+                app, registry.invoked_plugins(plugin_list, sys.argv[1:])
+            )
+            for group in app.registered_groups:
+                plugin_callback = group.typer_instance.registered_callback
+                if plugin_callback is not None:
+                    plugin_callback.callback = stop_on_interrupt(
+                        plugin_callback.callback
+                    )
+        app()
+    except KeyboardInterrupt:
+        # e.g. while the plugins are imported, before typer handles the command
+        printer.device_stopped()
+        sys.exit(0)
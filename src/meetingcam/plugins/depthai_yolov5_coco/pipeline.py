@@ -1,14 +1,28 @@
 import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import blobconverter
 import depthai
 from numpy.typing import NDArray
 
 from .utils import *
 
 
+@lru_cache(maxsize=1)
+def _load_config(config_path: Path) -> dict[str, Any]:
+    """Load and parse the model config once per process.
+
+    Args:
+        config_path --- the path to the json config file.
+
+    Returns:
+        The parsed config, to be treated as read only.
+    """
+    with config_path.open() as f:
+        return json.load(f)
+
+
 class PipelineHandler:
     """
     This class defines the depthai pipeline and the on device processing.
@@ -42,18 +56,9 @@ class PipelineHandler:
         if not configPath.exists():
             raise ValueError("Path {} does not exist!".format(configPath))
 
-        self.nnPath = str(
-            blobconverter.from_zoo(
-                name=self.model,
-                shaves=6,
-                zoo_type="depthai",
-                use_cache=True,
-                output_dir=self.model_dir,
-            )
-        )
+        self.nnPath = self._blob_path(shaves=6)
 
-        with configPath.open() as f:
-            config = json.load(f)
+        config = _load_config(configPath)
         nnConfig = config.get("nn_config", {})
 
         # parse input shape
@@ -75,6 +80,37 @@ class PipelineHandler:
         self.iouThreshold = metadata.get("iou_threshold", {})
         self.confidenceThreshold = metadata.get("confidence_threshold", {})
 
+    def _blob_path(self, shaves: int) -> str:
+        """Get the path of the compiled model blob, download it only if it is not in the model directory yet.
+
+        Args:
+            shaves --- the number of shaves the blob is compiled for.
+
+        Returns:
+            The path to the model blob.
+        """
+        # blobconverter names blobs {model}_openvino_{version}_{shaves}shave.blob
+        cached = sorted(
+            Path(self.model_dir).glob(
+                f"{self.model}_openvino_*_{shaves}shave.blob"
+            )
+        )
+        if cached:
+            return str(cached[-1])
+
+        # blobconverter is only needed (and imported) for the first download
+        import blobconverter
+
+        return str(
+            blobconverter.from_zoo(
+                name=self.model,
+                shaves=shaves,
+                zoo_type="depthai",
+                use_cache=True,
+                output_dir=self.model_dir,
+            )
+        )
+
     def create(self):
         # Create pipeline
         pipeline = depthai.Pipeline()
@@ -3,7 +3,8 @@ from typing import Any, Type
 
 import depthai
 import typer
-from constants import DEPTHAI, DevicePathDepthai
+from cli_types import DevicePathDepthai
+from constants import DEPTHAI
 from device import device_choice
 from numpy.typing import NDArray
 from runner import Runner
@@ -64,6 +65,8 @@ class Yolov5(PluginDepthai):
         device.qDet = device.getOutputQueue(
             name="nn", maxSize=1, blocking=False
         )
+        # latest detections, drawn until newer ones arrive
+        device.detections = []
 
         # Overwrite image height and width if needed, otherwise MAX_HEIGHT and MAX_WIDTH are used
         # device.height = MAX_HEIGHT
@@ -78,15 +81,24 @@ class Yolov5(PluginDepthai):
             device --- depthai device
         """
         inRgb = device.qRgb.get()
-        inDet = device.qDet.get()
+        # the network runs slower than the camera, don't hold back frames waiting for detections
+        inDet = device.qDet.tryGet()
 
-        if inRgb is not None:
-            image = inRgb.getCvFrame()
+        if inDet is not None:
+            device.detections = inDet.detections
 
-            if inDet is not None:
-                detections = inDet.detections
+        return inRgb.getCvFrame(), device.detections
 
-        return image, detections
+    def is_idle(self, keyhandler: Type[KeyHandler]) -> bool:
+        """Check if no detections would be drawn.
+
+        Args:
+            keyhandler --- keyhandler instance to enable/disable functionality by hotkey trigger.
+
+        Returns:
+            True if processing can be skipped, False otherwise.
+        """
+        return not keyhandler.l_trigger
 
     def process(
         self,
@@ -11,26 +11,30 @@ import sys
 import time
 from pathlib import Path
 
-import blobconverter
 import cv2
 import depthai as dai
 import numpy as np
 
 
 # nn data, being the bounding box locations, are in <0..1> range - they need to be normalized with frame width/height
+# works on a single bbox as well as on an (N, 4) array of bboxes
 def _frameNorm(frame, bbox):
-    normVals = np.full(len(bbox), frame.shape[0])
+    bbox = np.asarray(bbox, dtype=np.float32)
+    normVals = np.full(bbox.shape[-1], frame.shape[0], dtype=np.float32)
     normVals[::2] = frame.shape[1]
-    return (np.clip(np.array(bbox), 0, 1) * normVals).astype(int)
+    return (np.clip(bbox, 0, 1) * normVals).astype(np.int32)
 
 
 def displayFrame(frame, detections, labels):
     color = (255, 0, 0)
-    for detection in detections:
-        bbox = _frameNorm(
-            frame,
-            (detection.xmin, detection.ymin, detection.xmax, detection.ymax),
-        )
+    if not detections:
+        return frame
+    # normalize all bboxes at once, the loop only draws
+    bboxes = _frameNorm(
+        frame,
+        [(d.xmin, d.ymin, d.xmax, d.ymax) for d in detections],
+    ).tolist()
+    for detection, bbox in zip(detections, bboxes):
         cv2.putText(
             frame,
             labels[detection.label],
@@ -1,13 +1,44 @@
+from functools import lru_cache
+from pathlib import Path
 from typing import Any
 
-import cv2
 import numpy as np
 from numpy.typing import NDArray
-from openvino.runtime import Core
+from openvino.preprocess import PrePostProcessor, ResizeAlgorithm
+from openvino.runtime import CompiledModel, Core, Layout, Type
 
 from .utils import non_max_suppression
 
 
+@lru_cache(maxsize=None)
+def _compile(model_path: str) -> CompiledModel:
+    """Read and compile the face detection model, once per process and model path.
+
+    Args:
+        model_path --- the path to the neural network model file.
+
+    Returns:
+        The compiled model, which is shared by all FaceDetector instances of this model.
+    """
+    core = Core()
+    # the compiled model is cached on disk, later launches skip the compilation
+    core.set_property({"CACHE_DIR": str(Path(model_path).parent / "cache")})
+    model = core.read_model(model_path)
+    # resize and layout conversion of the BGR frames are part of the compiled model
+    ppp = PrePostProcessor(model)
+    ppp.input().tensor().set_element_type(Type.u8).set_layout(
+        Layout("NHWC")
+    ).set_spatial_dynamic_shape()
+    ppp.input().preprocess().convert_element_type(Type.f32).resize(
+        ResizeAlgorithm.RESIZE_LINEAR
+    )
+    ppp.input().model().set_layout(Layout("NCHW"))
+    model = ppp.build()
+    # one frame at a time, optimize for latency instead of throughput
+    # the precision is left to the device, e.g. f16 on GPUs and bf16 on CPUs supporting it
+    return core.compile_model(model, "AUTO", {"PERFORMANCE_HINT": "LATENCY"})
+
+
 class FaceDetector:
     """
     This class utilizes a pre-trained model for detecting faces in images.
@@ -43,25 +74,32 @@ class FaceDetector:
         Raises:
             Various exceptions can be raised by openvino runtime methods if the model file is not found or has errors.
         """
-        core = Core()
-        model = core.read_model(str(model_path))
-        self.model = core.compile_model(model)
+        self.model = _compile(str(model_path))
         self.confidence_thr = confidence_thr
         self.overlap_thr = overlap_thr
 
+        # two infer requests, the current frame is inferred while the previous one is postprocessed
+        self._requests = [self.model.create_infer_request() for _ in range(2)]
+        self._n = 0
+        self._pending = None
+
+    def reset(self) -> None:
+        """Drop the frame in flight, e.g. while no inference is needed, so that no outdated detections are returned later."""
+        if self._pending is not None:
+            self._pending[0].wait()
+            self._pending = None
+
     def preprocess(self, image: NDArray[Any]) -> NDArray[Any]:
         """
-        Resize and prepare BGR image for neural network.
+        Prepare BGR image for neural network, which resizes it itself.
 
         Args:
             image --- the input image array.
 
         Returns:
-            The processed image array ready to be fed into the neural network.
+            The image array as batch ready to be fed into the neural network.
         """
-        input_image = cv2.resize(image, dsize=[320, 240])
-        input_image = np.expand_dims(input_image.transpose(2, 0, 1), axis=0)
-        return input_image
+        return image[np.newaxis]
 
     def postprocess(
         self,
@@ -81,7 +119,7 @@ class FaceDetector:
             image_shape --- the shape of the input image.
 
         Returns:
-            A tuple containing two lists: one for bounding boxes and another for scores.
+            A tuple containing the int32 bounding boxes as (N, 4) array and their scores, or two empty lists.
         """
 
         # filter
@@ -97,47 +135,53 @@ class FaceDetector:
         # convert all boxes to image coordinates
         h, w = image_shape
 
-        def _convert_bbox_format(*args: list[int]):
-            bbox = args[0]
-            x_min, y_min, x_max, y_max = bbox
-            x_min = int(w * x_min)
-            y_min = int(h * y_min)
-            x_max = int(w * x_max)
-            y_max = int(h * y_max)
-            return x_min, y_min, x_max, y_max
-
-        bboxes_image_coord = np.apply_along_axis(
-            _convert_bbox_format, axis=2, arr=filtered_boxes
-        )
+        bboxes_image_coord = (
+            filtered_boxes.reshape(-1, 4)
+            * np.array([w, h, w, h], dtype=np.float32)
+        ).astype(np.int32)
 
         # apply non-maximum supressions
         bboxes_image_coord, indexes = non_max_suppression(
-            bboxes_image_coord.reshape([-1, 4]), threshold=self.overlap_thr
+            bboxes_image_coord, threshold=self.overlap_thr
         )
         filtered_scores = filtered_scores[indexes]
         return bboxes_image_coord, filtered_scores
 
     def inference(
-        self, image: NDArray[Any]
+        self, image: NDArray[Any], pipelined: bool = True
     ) -> tuple[NDArray[Any], NDArray[Any]]:
         """
         Run the entire inference pipeline on an input image.
 
-        This method preprocesses the input image, performs inference using the neural network,
-        and postprocesses the predictions to obtain final results.
+        This method preprocesses the input image, starts the inference using the neural network,
+        and postprocesses the predictions of the previous image, which was inferred meanwhile.
+        Without pipelining, it waits for and postprocesses the predictions of the input image instead.
 
         Args:
             image --- the input image array.
+            pipelined --- return the results of the previous image, one frame behind. Defaults to True.
 
         Returns:
             A tuple containing two arrays: one for faces and another for scores.
         """
         input_image = self.preprocess(image)
+        if not pipelined:
+            # nothing is left in flight, the current request is waited for
+            self.reset()
+
+        request = self._requests[self._n]
+        self._n ^= 1
+        request.start_async({0: input_image})
+
+        # results are one frame behind, except for the very first frame after a reset
+        # the shape is kept with the request, the boxes are mapped to the frame they are detected in
+        previous, self._pending = self._pending, (request, image.shape[:2])
+        if previous is None:
+            previous = self._pending
+        previous_request, image_shape = previous
+        previous_request.wait()
+        pred_scores = previous_request.get_output_tensor(0).data
+        pred_boxes = previous_request.get_output_tensor(1).data
 
-        pred = self.model([input_image])
-        pred_scores = pred[self.model.output(0)]
-        pred_boxes = pred[self.model.output(1)]
-
-        image_shape = image.shape[:2]
         faces, scores = self.postprocess(pred_scores, pred_boxes, image_shape)
         return faces, scores
@@ -1,11 +1,13 @@
 import sys
+from functools import lru_cache
 from math import ceil
 from pathlib import Path
 from typing import Any, Optional, Type
 
 import cv2
 import typer
-from constants import WEBCAM, DevicePathWebcam
+from cli_types import DevicePathWebcam
+from constants import WEBCAM
 from device import device_choice
 from numpy.typing import NDArray
 from runner import Runner
@@ -13,7 +15,7 @@ from utils import Hotkey, KeyHandler
 
 from ..plugin_utils import PluginBase
 from .model import FaceDetector
-from .utils import box_area, draw_bbox
+from .utils import draw_bbox
 
 name = "face-detector"
 short_description = "First person face detector"
@@ -39,19 +41,47 @@ plugin_app = typer.Typer(
 plugin_app.type = TYPE
 
 
+@lru_cache(maxsize=4)
+def _style(
+    h: int, th_scale: float, fn_scale: float, off_scale: float
+) -> tuple[int, int, int, float, int]:
+    """Compute the drawing style for an image height, which is constant for a stream.
+
+    Args:
+        h --- the image height.
+        th_scale --- relative thickness of the lines.
+        fn_scale --- relative font size.
+        off_scale --- relative Y-offset of the text.
+
+    Returns:
+        A tuple of thickness, corner radius, corner length, font scale and text offset.
+    """
+    thickness = ceil(h * th_scale)
+    radius = ceil(h * th_scale * 4)
+    corner_len = ceil(h * th_scale * 8)
+    return thickness, radius, corner_len, h * fn_scale, int(h * off_scale)
+
+
 class FaceDetection(PluginBase):
     """A plugin for detecting faces in an image.
 
     This plugin extends the PluginBase class and is used to detect faces in an image using a pretrained face detection model.
     """
 
-    def __init__(self, name: str | None = None) -> None:
+    def __init__(
+        self,
+        name: str | None = None,
+        detect_every: int = 2,
+        pipelined: bool = False,
+    ) -> None:
         """Initialize the FaceDetection plugin with a specified name.
 
         This method initializes the FaceDetection plugin and sets up the necessary parameters including model paths, and name.
 
         Args:
             name --- the name of the user. If not provided, a default name is assigned.
+            detect_every --- run the face detection only every n-th frame, detections are reused in between. Defaults to 2.
+            pipelined --- infer a frame while the previous one is drawn and sent, detections lag one more frame. Defaults to False.
 
         Raises:
             SystemExit: If the model files are not found in the specified directory.
@@ -64,11 +94,24 @@ class FaceDetection(PluginBase):
         self.off_scale = (
             3e-2  # Adjust for larger Y-offset of text and bounding box
         )
+        # run the detector only every n-th frame, the face barely moves in between
+        self.detect_every = detect_every
+        # independent of detect_every, a pipelined detection is one frame old before it is reused
+        self.pipelined = pipelined
+        self._frame_idx = 0
+        self._last_detection = ([], [])
 
         model_path = (
             Path(self.model_dir)
             / "public/ultra-lightweight-face-detection-rfb-320/FP16/ultra-lightweight-face-detection-rfb-320.xml"
         )
+        # prefer the INT8 model if it was created with tools/quantize_face_detection.py
+        int8_path = (
+            model_path.parent.parent
+            / "INT8/ultra-lightweight-face-detection-rfb-320.xml"
+        )
+        if int8_path.exists():
+            model_path = int8_path
 
         if not model_path.exists():
             print(
@@ -112,6 +155,24 @@ class FaceDetection(PluginBase):
         ]
         self.verbose = True
 
+    def is_idle(self, keyhandler: Type[KeyHandler]) -> bool:
+        """Check if neither the face bbox nor the name would be drawn.
+
+        Args:
+            keyhandler --- keyhandler instance to enable/disable functionality by hotkey trigger.
+
+        Returns:
+            True if face detection can be skipped, False otherwise.
+        """
+        return not keyhandler.f_trigger and not (
+            keyhandler.n_trigger and self.name
+        )
+
+    def on_idle(self) -> None:
+        """Drop the frame in flight and the last detection, they would be outdated once the overlays are enabled again."""
+        self.detector.reset()
+        self._frame_idx = 0
+
     def process(
         self,
         image: NDArray[Any],
@@ -129,37 +190,50 @@ class FaceDetection(PluginBase):
         Returns:
             The processed image with face and name annotations.
         """
-        bboxes, scores = self.detector.inference(image)
+        # nothing to draw, skip the inference, e.g. if process is called without the runner's idle check
+        if self.is_idle(keyhandler):
+            self.on_idle()
+            return image
+
+        if self._frame_idx % self.detect_every == 0:
+            self._last_detection = self.detector.inference(
+                image, pipelined=self.pipelined
+            )
+        self._frame_idx += 1
+        bboxes, scores = self._last_detection
 
         if len(bboxes) > 0:
             # Assumption: The persons face in front of the web cam is the one which is closest to the camera and hence the biggest.
             # So we get the detection result with the biggest bbox area.
-            box_areas = [box_area(box) for box in bboxes]
-            idx = box_areas.index(max(box_areas))
-            h, w = image.shape[0:2]
+            idx = (
+                (bboxes[:, 2] - bboxes[:, 0]) * (bboxes[:, 3] - bboxes[:, 1])
+            ).argmax()
+            x1, y1, x2, y2 = bboxes[idx].tolist()
+            thickness, radius, corner_len, font_scale, y_off = _style(
+                image.shape[0], self.th_scale, self.fn_scale, self.off_scale
+            )
 
             # If f_trigger <Ctrl+Alt+f> is True, print in the face bbox
             if keyhandler.f_trigger:
                 image = draw_bbox(
                     image,
-                    bboxes[idx][:2],
-                    bboxes[idx][2:],
+                    (x1, y1),
+                    (x2, y2),
                     color=(0, 255, 0),
-                    thickness=ceil(h * self.th_scale),
-                    radius=ceil(h * self.th_scale * 4),
-                    corner_len=ceil(h * self.th_scale * 8),
+                    thickness=thickness,
+                    radius=radius,
+                    corner_len=corner_len,
                 )
             # If n_trigger <Ctrl+Alt+n> is True, print in the name above the bbox
             if keyhandler.n_trigger and self.name:
-                x1, y1 = bboxes[idx][:2]
                 image = cv2.putText(
                     image,
                     self.name,
-                    (x1, y1 - int(h * self.off_scale)),
+                    (x1, y1 - y_off),
                     fontFace=cv2.FONT_HERSHEY_SIMPLEX,
-                    fontScale=h * self.fn_scale,
+                    fontScale=font_scale,
                     color=(0, 255, 0),
-                    thickness=ceil(h * self.th_scale),
+                    thickness=thickness,
                 )
         return image
 
@@ -170,6 +244,21 @@ def main(
     name: Optional[str] = typer.Option(
         default="", help="Name imprinted above the face detection."
     ),
+    detect_every: int = typer.Option(
+        default=2,
+        min=1,
+        help=(
+            "Run the face detection only every n-th frame, the face box is"
+            " reused in between."
+        ),
+    ),
+    pipelined: bool = typer.Option(
+        default=False,
+        help=(
+            "Infer a frame while the previous one is drawn and sent. Faster,"
+            " but the face box lags one more frame."
+        ),
+    ),
 ):
     # define plugin
     if not name:
@@ -177,7 +266,7 @@ def main(
             "A name will be imprinted above the face detection.\nWhat's your"
             " name?"
         )
-    plugin = FaceDetection(name)
+    plugin = FaceDetection(name, detect_every, pipelined)
 
     # define runner
     runner = Runner(plugin, device_path)
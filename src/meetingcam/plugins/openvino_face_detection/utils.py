@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Any
 
 import cv2
@@ -14,7 +15,7 @@ def non_max_suppression(
     a tuple containing a list of suppressed bounding boxes and their respective indexes.
 
     Args:
-        boxes --- a numpy array of bounding boxes.
+        boxes --- a numpy array of bounding boxes in pixel coordinates.
         threshold --- the overlap threshold for suppression.
 
     Returns:
@@ -31,17 +32,19 @@ def non_max_suppression(
     # initialize the list of picked indexes
     pick = []
 
-    # grab the coordinates of the bounding boxes
-    x1 = boxes[:, 0]
-    y1 = boxes[:, 1]
-    x2 = boxes[:, 2]
-    y2 = boxes[:, 3]
+    # grab the coordinates of the bounding boxes, pixel coordinates
+    # fit into int32 which halves the memory traffic of the loop
+    x1, y1, x2, y2 = np.ascontiguousarray(boxes.T, dtype=np.int32)
 
     # compute the area of the bounding boxes and sort the boxes by
     # their bottom-right y-coordinate
     area = (x2 - x1 + 1) * (y2 - y1 + 1)
     idxs = np.argsort(y2)
 
+    # scratch buffers reused for every pick instead of allocating new ones
+    buf_x1, buf_y1, buf_x2, buf_y2 = np.empty((4, len(idxs)), dtype=np.int32)
+    buf_overlap = np.empty(len(idxs), dtype=np.float64)
+
     # keep looping while some indexes still remain in the indexes list
     while len(idxs) > 0:
         # grab the last index in the indexes list and add the index
@@ -49,34 +52,53 @@ def non_max_suppression(
         last = len(idxs) - 1
         i = idxs[last]
         pick.append(i)
+        rest = idxs[:last]
 
         # find the largest (x, y) coordinates for the start of the
         # bounding box and the smallest (x, y) coordinates for the
         # end of the bounding box
-        xx1 = np.maximum(x1[i], x1[idxs[:last]])
-        yy1 = np.maximum(y1[i], y1[idxs[:last]])
-        xx2 = np.minimum(x2[i], x2[idxs[:last]])
-        yy2 = np.minimum(y2[i], y2[idxs[:last]])
-
-        # compute the width and height of the bounding box
-        w = np.maximum(0, xx2 - xx1 + 1)
-        h = np.maximum(0, yy2 - yy1 + 1)
+        xx1 = np.maximum(x1[i], x1[rest], out=buf_x1[:last])
+        yy1 = np.maximum(y1[i], y1[rest], out=buf_y1[:last])
+        xx2 = np.minimum(x2[i], x2[rest], out=buf_x2[:last])
+        yy2 = np.minimum(y2[i], y2[rest], out=buf_y2[:last])
+
+        # compute the width and height of the bounding box, in place
+        xx2 -= xx1
+        xx2 += 1
+        yy2 -= yy1
+        yy2 += 1
+        w = np.maximum(xx2, 0, out=xx2)
+        h = np.maximum(yy2, 0, out=yy2)
 
         # compute the ratio of overlap between the bounding box and
         # other bounding boxes
-        overlap = (w * h) / area[idxs[:last]]
+        w *= h
+        overlap = np.divide(w, area[rest], out=buf_overlap[:last])
 
-        # delete all indexes from the index list that have overlap
-        # greater than the provided overlap threshold
-        idxs = np.delete(
-            idxs,
-            np.concatenate(([last], np.where(overlap > threshold)[0])),
-        )
+        # keep only the remaining indexes with an overlap up to the
+        # provided overlap threshold
+        idxs = rest[overlap <= threshold]
 
     # return only the bounding boxes that were picked
     return boxes[pick], pick
 
 
+@lru_cache(maxsize=8)
+def _corner_arcs(radius: int) -> tuple[NDArray[Any], ...]:
+    """Compute the 90 degree arcs of the rounded corners around the origin.
+
+    Args:
+        radius --- the radius of the rounded corners.
+
+    Returns:
+        The arcs of the top left, top right, bottom left and bottom right corner.
+    """
+    return tuple(
+        cv2.ellipse2Poly((0, 0), (radius, radius), angle, 0, 90, 5)
+        for angle in (180, 270, 90, 0)
+    )
+
+
 def draw_bbox(
     img: NDArray[Any],
     pt1: tuple[int, int],
@@ -116,47 +138,39 @@ def draw_bbox(
     r = radius
     d = corner_len
 
-    # Top left
-    cv2.line(img, (x1 + r, y1), (x1 + r + d, y1), color, thickness)
-    cv2.line(img, (x1, y1 + r), (x1, y1 + r + d), color, thickness)
-    cv2.ellipse(img, (x1 + r, y1 + r), (r, r), 180, 0, 90, color, thickness)
-
-    # Top right
-    cv2.line(img, (x2 - r, y1), (x2 - r - d, y1), color, thickness)
-    cv2.line(img, (x2, y1 + r), (x2, y1 + r + d), color, thickness)
-    cv2.ellipse(img, (x2 - r, y1 + r), (r, r), 270, 0, 90, color, thickness)
-
-    # Bottom left
-    cv2.line(img, (x1 + r, y2), (x1 + r + d, y2), color, thickness)
-    cv2.line(img, (x1, y2 - r), (x1, y2 - r - d), color, thickness)
-    cv2.ellipse(img, (x1 + r, y2 - r), (r, r), 90, 0, 90, color, thickness)
-
-    # Bottom right
-    cv2.line(img, (x2 - r, y2), (x2 - r - d, y2), color, thickness)
-    cv2.line(img, (x2, y2 - r), (x2, y2 - r - d), color, thickness)
-    cv2.ellipse(img, (x2 - r, y2 - r), (r, r), 0, 0, 90, color, thickness)
+    # each corner is one polyline: straight line, rounded arc, straight line
+    corners = [
+        # Top left
+        ((x1, y1 + r + d), (x1 + r, y1 + r), (x1 + r + d, y1)),
+        # Top right
+        ((x2 - r - d, y1), (x2 - r, y1 + r), (x2, y1 + r + d)),
+        # Bottom left
+        ((x1 + r + d, y2), (x1 + r, y2 - r), (x1, y2 - r - d)),
+        # Bottom right
+        ((x2, y2 - r - d), (x2 - r, y2 - r), (x2 - r - d, y2)),
+    ]
+    # the arcs only depend on the radius, they are translated to the corners
+    corner_lines = [
+        np.concatenate(([start], arc + center, [end]), dtype=np.int32)
+        for (start, center, end), arc in zip(corners, _corner_arcs(r))
+    ]
+    # one call draws all corners instead of four lines and ellipses each
+    cv2.polylines(img, corner_lines, False, color, thickness)
 
     if connected:
-        # Top left to top right
-        cv2.line(img, (x1 + r + d, y1), (x2 - r, y1), color, c_thickness)
-        # Bottom left to Bottom right
-        cv2.line(img, (x1 + r + d, y2), (x2 - r, y2), color, c_thickness)
-        # Bottom left to top left
-        cv2.line(img, (x1, y2 - r - d), (x1, y1 + r + d), color, c_thickness)
-        # Bottom right to top right
-        cv2.line(img, (x2, y2 - r - d), (x2, y1 + r + d), color, c_thickness)
+        connecting_lines = np.array(
+            [
+                # Top left to top right
+                [(x1 + r + d, y1), (x2 - r, y1)],
+                # Bottom left to Bottom right
+                [(x1 + r + d, y2), (x2 - r, y2)],
+                # Bottom left to top left
+                [(x1, y2 - r - d), (x1, y1 + r + d)],
+                # Bottom right to top right
+                [(x2, y2 - r - d), (x2, y1 + r + d)],
+            ],
+            dtype=np.int32,
+        )
+        cv2.polylines(img, list(connecting_lines), False, color, c_thickness)
 
     return img
-
-
-def box_area(box: list[int]) -> int:
-    """Calculate the area of a bounding box.
-
-    Args:
-        box --- a list of integers representing the bounding box in the format [x_min, y_min, x_max, y_max].
-
-    Returns:
-       The area of the bounding box.
-    """
-    area = int(box[2] - box[0]) * (box[3] - box[1])
-    return area
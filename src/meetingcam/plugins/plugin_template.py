@@ -2,7 +2,8 @@ from typing import Any, Optional, Type
 
 import cv2
 import typer
-from constants import WEBCAM, DevicePathWebcam
+from cli_types import DevicePathWebcam
+from constants import WEBCAM
 from device import device_choice
 from numpy.typing import NDArray
 from runner import Runner
@@ -10,10 +11,10 @@ from utils import Hotkey, KeyHandler
 
 from ..plugin_utils import PluginBase
 
-name = "{{name}}"  # modifiable
-short_description = "{{short_description}}"  # modifiable
+name = "$name"  # modifiable
+short_description = "$short_description"  # modifiable
 description = """
-{{description}}"""  # modifiable
+$description"""  # modifiable
 
 TYPE = WEBCAM
 DevicePath = device_choice(TYPE)
@@ -1,13 +1,17 @@
+import ast
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import depthai
 import typer
 from constants import DEPTHAI, WEBCAM
 from numpy.typing import NDArray
+from typer.main import get_command_name
 from utils import KeyHandler
 
+if TYPE_CHECKING:
+    import depthai
+
 
 class PluginBase(ABC):
     """PluginBase class acts as a base class for plugins with image processing capabilities.
@@ -54,6 +58,23 @@ class PluginBase(ABC):
         """
         pass
 
+    def is_idle(self, keyhandler: KeyHandler) -> bool:
+        """Check if processing can be skipped for the current trigger states.
+
+        Plugins which only draw while a trigger is active overwrite this, so that no inference runs while nothing would be drawn.
+
+        Args:
+            keyhandler --- keyhandler instance with the current trigger and switch states.
+
+        Returns:
+            True if process would return the image unchanged, False otherwise.
+        """
+        return False
+
+    def on_idle(self) -> None:
+        """Called once when processing is skipped after having been active, e.g. to drop state which would be outdated later on."""
+        pass
+
     def keyhandler(self) -> KeyHandler:
         """Return the keyhandler for this plugin."""
         return KeyHandler(self.hotkeys, self.verbose)
@@ -87,7 +108,7 @@ class PluginDepthai(PluginBase):
     @abstractmethod
     def acquisition(
         self, device
-    ) -> tuple[NDArray[Any], list[depthai.ImgDetection]]:
+    ) -> tuple[NDArray[Any], list["depthai.ImgDetection"]]:
         """Acquire an image and optionally detections from camera queue and return them.
 
         Args:
@@ -126,6 +147,70 @@ class PluginRegistry:
                 plugin_app, name=plugin_name, help=help, short_help=short_help
             )
 
+    def invokes_command(
+        self, main_app: typer.main.Typer, args: list[str]
+    ) -> bool:
+        """Check if the command line arguments invoke a command of the main app instead of a plugin.
+
+        Args:
+            main_app --- typer main app with the general commands registered.
+            args --- command line arguments without the script name.
+
+        Returns:
+            True if a general command is invoked, False if a plugin or no command is invoked.
+        """
+        commands = {
+            command.name or get_command_name(command.callback.__name__)
+            for command in main_app.registered_commands
+        }
+        return self._invoked(args) in commands
+
+    def invoked_plugins(
+        self,
+        plugin_list: list,
+        args: list[str],
+        path: str = "src/meetingcam/plugins",
+    ) -> list:
+        """Select the plugins to register, only the invoked one if it is known without importing the plugins.
+
+        Args:
+            plugin_list --- names of the found and valid plugins.
+            args --- command line arguments without the script name.
+            path --- plugin directory. Defaults to "src/meetingcam/plugins".
+
+        Returns:
+            The invoked plugin, or all plugins for the help, no command or an unknown command.
+        """
+        invoked = self._invoked(args)
+        if invoked is None:
+            return plugin_list
+        for plugin in plugin_list:
+            if invoked in (plugin, self._plugin_name(Path(path) / plugin)):
+                return [plugin]
+        return plugin_list
+
+    def _invoked(self, args: list[str]) -> str | None:
+        """Return the first positional argument, which is the invoked command."""
+        return next((arg for arg in args if not arg.startswith("-")), None)
+
+    def _plugin_name(self, path: Path) -> str | None:
+        """Read the command name of a plugin from its module level `name`, without importing the plugin."""
+        try:
+            module = ast.parse((path / "plugin.py").read_text())
+        except (OSError, SyntaxError):
+            return None
+        for node in module.body:
+            if (
+                isinstance(node, ast.Assign)
+                and any(
+                    isinstance(target, ast.Name) and target.id == "name"
+                    for target in node.targets
+                )
+                and isinstance(node.value, ast.Constant)
+            ):
+                return node.value.value
+        return None
+
     def search_plugins(self, path: str = "src/meetingcam/plugins") -> list:
         """Check plugin directory for plugins and return list with found and valid plugins."""
         dirs = [d for d in Path(path).iterdir() if d.is_dir()]
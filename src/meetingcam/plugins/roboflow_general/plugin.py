@@ -5,7 +5,8 @@ from typing import Any, Optional, Type
 import requests
 import supervision as sv
 import typer
-from constants import WEBCAM, DevicePathWebcam
+from cli_types import DevicePathWebcam
+from constants import WEBCAM
 from device import device_choice
 from numpy.typing import NDArray
 from roboflow import Roboflow
@@ -140,6 +141,17 @@ class RoboflowDetection(PluginBase):
         ]
         self.verbose = True
 
+    def is_idle(self, keyhandler: Type[KeyHandler]) -> bool:
+        """Check if the inference server would not be queried.
+
+        Args:
+            keyhandler --- keyhandler instance to enable/disable functionality by hotkey trigger.
+
+        Returns:
+            True if processing can be skipped, False otherwise.
+        """
+        return not keyhandler.l_trigger
+
     def process(
         self,
         image: NDArray[Any],
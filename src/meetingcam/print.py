@@ -1,16 +1,21 @@
 """This file contains a printing class which is used for common terminal prints."""
 
+import shlex
 from typing import Any
 
-import pyfiglet
 import rich
 from constants import DEPTHAI, WEBCAM
 from rich.console import Console
 from rich.style import Style
-from rich.table import Table
 from rich.text import Text
 from v4l2ctl import V4l2Device
 
+# shared by all printers, styles are immutable
+_CONSOLE = Console()
+_STYLE_DANGER = Style(color="red", blink=True, bold=True)
+_STYLE_WARNING = Style(color="yellow", blink=True, bold=True)
+_STYLE_OK = Style(color="green", blink=True, bold=True)
+
 
 class Printer:
     """Handles printing functions for common terminal prints"""
@@ -19,12 +24,12 @@ class Printer:
         """
         Initialize the DevicePrinter.
 
-        Instantiates a Console object and initializes styles for different types of messages (danger, warning, ok).
+        Binds the shared Console object and the styles for different types of messages (danger, warning, ok).
         """
-        self.console = Console()
-        self.danger_style = Style(color="red", blink=True, bold=True)
-        self.warning_style = Style(color="yellow", blink=True, bold=True)
-        self.ok_style = Style(color="green", blink=True, bold=True)
+        self.console = _CONSOLE
+        self.danger_style = _STYLE_DANGER
+        self.warning_style = _STYLE_WARNING
+        self.ok_style = _STYLE_OK
 
     def available_devices(
         self,
@@ -40,34 +45,18 @@ class Printer:
             device_map --- a mapping of device ids to device properties including paths and labels.
             available_devices_real --- a tuple containing lists of paths, labels, ids, and another attribute of real devices.
 
-        The method extracts real and mapped device information and formats them for console printing.
+        The method looks up the virtual counterpart of each real device and prints them as a table.
         """
 
         (paths_real, labels_real) = available_devices_real
 
-        devices_real = [
-            "|" + label + "|" + str(path) + "|"
-            for label, path in zip(labels_real, paths_real)
-        ]
-        devices_real = (
-            str(devices_real).replace("'", "").replace(", ", "\n")[1:-1]
-        )
+        # label of the virtual counterpart by real device path
+        labels_virtual = {
+            d["path_real"]: d["label_virtual"] for d in device_map.values()
+        }
 
-        devices_mapped = [
-            "|"
-            + v["label_real"]
-            + "|"
-            + v["path_real"]
-            + " -> |"
-            + v["label_virtual"]
-            + "|"
-            + v["path_virtual"]
-            + "|"
-            for v in device_map.values()
-        ]
-        devices_mapped = (
-            str(devices_mapped).replace("'", "").replace(", ", "\n")[1:-1]
-        )
+        # only needed when devices are listed
+        from rich.table import Table
 
         table = Table()
         table.add_column(
@@ -78,18 +67,11 @@ class Printer:
             "Virtual camera name", justify="right", style="cyan", no_wrap=True
         )
 
-        for rp, rn in zip(
-            available_devices_real[0], available_devices_real[1]
-        ):
-            cam = {"label_real": rn, "path_real": rp, "label_virtual": None}
-            for d in device_map.values():
-                if d["path_real"] == rp:
-                    cam["label_virtual"] = d["label_virtual"]
-
+        for path, label in zip(paths_real, labels_real):
             table.add_row(
-                str(cam["label_real"]),
-                str(cam["path_real"]),
-                str(cam["label_virtual"]),
+                str(label),
+                str(path),
+                str(labels_virtual.get(path)),
             )
 
         self.console.print(table)
@@ -110,39 +92,40 @@ class Printer:
         (device_paths, labels) = available_devices_real
 
         cli_cmd_single = {}
-        labels_str = []
 
         if type == WEBCAM:
             ids = [
-                int(path.replace("/dev/video", "")) for path in device_paths
+                int(path.removeprefix("/dev/video")) for path in device_paths
             ]
-            vd_nrs = ids
-            for idx, label in zip(ids, labels):
+            labels_virtual = [
+                f"MeetingCam{idx} {label}" for idx, label in zip(ids, labels)
+            ]
+            for label, label_virtual, idx in zip(labels, labels_virtual, ids):
                 cli_cmd_single[label] = (
-                    "`sudo modprobe v4l2loopback devices=1"
-                    f" video_nr={idx} card_label='MeetingCam{idx} {label}'`"
+                    "sudo modprobe v4l2loopback devices=1"
+                    f" video_nr={idx} card_label={shlex.quote(label_virtual)}"
                 )
-                labels_str.append(f"MeetingCam{idx} {label}")
 
-            labels_str = str(labels_str).replace(", ", ",")[1:-1]
-            vd_nrs = str(vd_nrs).replace(" ", "")[1:-1]
             cli_cmd_multi = (
-                "`sudo modprobe v4l2loopback"
-                f" devices={len(ids)} video_nr={str(vd_nrs)} card_label='{labels_str[1:-1]}'`"
+                "sudo modprobe v4l2loopback"
+                f" devices={len(ids)} video_nr={','.join(map(str, ids))}"
+                f" card_label={shlex.quote(','.join(labels_virtual))}"
             )
         elif type == DEPTHAI:
             ids = device_paths
-            for idx, label in zip(ids, labels):
+            labels_virtual = [
+                f"MeetingCam{idx} {label}" for idx, label in zip(ids, labels)
+            ]
+            for label, label_virtual in zip(labels, labels_virtual):
                 cli_cmd_single[label] = (
-                    "`sudo modprobe v4l2loopback devices=1"
-                    f" card_label='MeetingCam{idx} {label}'`"
+                    "sudo modprobe v4l2loopback devices=1"
+                    f" card_label={shlex.quote(label_virtual)}"
                 )
-                labels_str.append(f"MeetingCam{idx} {label}")
 
-            labels_str = str(labels_str).replace(", ", ",")[1:-1]
             cli_cmd_multi = (
-                "`sudo modprobe v4l2loopback"
-                f" devices={len(ids)} card_label='{labels_str[1:-1]}'`"
+                "sudo modprobe v4l2loopback"
+                f" devices={len(ids)}"
+                f" card_label={shlex.quote(','.join(labels_virtual))}"
             )
 
         else:
@@ -156,13 +139,13 @@ class Printer:
                 " the following commands:"
             )
             for label, cmd in cli_cmd_single.items():
-                cmd = Text(cmd[1:-1])
+                cmd = Text(cmd)
                 self.console.print(f"\n{label}:")
                 self.console.print(cmd, style="cyan bold")
             self.console.print(
                 "\n\n[bold]Add all devices[/bold] with the following command:"
             )
-            cmd = Text("\n" + cli_cmd_multi[1:-1])
+            cmd = Text("\n" + cli_cmd_multi)
             self.console.print(cmd, style="cyan bold")
 
     def device_not_available(self, device: V4l2Device) -> None:
@@ -227,6 +210,8 @@ class Printer:
 
     def title(self) -> None:
         """Print MeeingCam title."""
+        import pyfiglet
+
         title = pyfiglet.figlet_format("MeetingCam", font="big")
         title = Text(title)
         title.stylize("bold green", 0, 234)
@@ -235,6 +220,8 @@ class Printer:
 
     def subtitle(self, name: str) -> None:
         """Print Plugin title."""
+        import pyfiglet
+
         title = pyfiglet.figlet_format(name, font="big")
         title = Text(title)
         rich.print(title)
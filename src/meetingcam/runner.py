@@ -1,11 +1,83 @@
 """This file contains a runner class which is initializing and running the main loop within MeetingCam."""
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
+
 import cv2
+import numpy as np
 import pyvirtualcam
 from constants import DEPTHAI, WEBCAM
 from device import DepthaiDevice, WebcamDevice
+from numpy.typing import NDArray
 from plugins.plugin_utils import PluginBase, PluginDepthai
-from utils import KeyHandler
+from utils import KeyHandler, VideoCapture
+
+if TYPE_CHECKING:
+    from depthai_capture import DepthaiCapture
+
+
+class FrameReader(threading.Thread):
+    """Read frames from the real camera in the background, keeping only the latest one.
+
+    Frames which are not picked up before the next one arrives are dropped, so processing always works on the freshest frame.
+    """
+
+    def __init__(self, get_frame: Callable[[], tuple[NDArray[Any], Any]]):
+        """Initialize the reader thread.
+
+        Args:
+            get_frame --- function returning the next frame and detection of the real camera.
+        """
+        super().__init__(daemon=True)
+        self._get_frame = get_frame
+        self._condition = threading.Condition()
+        self._latest = None
+        self._error = None
+        self._stopped = False
+
+    def run(self) -> None:
+        """Read frames until stopped, hand over errors to the reading thread."""
+        try:
+            while not self._stopped:
+                latest = self._get_frame()
+                with self._condition:
+                    self._latest = latest
+                    self._condition.notify()
+        except BaseException as error:
+            with self._condition:
+                self._error = error
+                self._condition.notify()
+
+    def get(self) -> tuple[NDArray[Any], Any]:
+        """Wait for a frame newer than the last one returned.
+
+        Returns:
+            The latest frame and detection.
+
+        Raises:
+            The error which stopped the camera from delivering frames.
+        """
+        with self._condition:
+            while self._latest is None and self._error is None:
+                self._condition.wait()
+            if self._latest is None:
+                raise self._error
+            latest, self._latest = self._latest, None
+            return latest
+
+    def stop(self, timeout: float = 2.0) -> bool:
+        """Stop reading and wait until the camera is no longer accessed.
+
+        Args:
+            timeout --- seconds to wait for the current read to return, e.g. a hanging camera never returns.
+
+        Returns:
+            True if the reader stopped, False if it is still blocked in reading the camera.
+        """
+        self._stopped = True
+        self.join(timeout)
+        return not self.is_alive()
 
 
 class Runner:
@@ -54,18 +126,34 @@ class Runner:
             for h in self.plugin.hotkeys:
                 print(f"{h.hotkey}:    {h.description}")
             print("")
+
+        try:
+            self._stream()
+        except KeyboardInterrupt:
+            # camera devices are released by their context managers
+            self.device_handler.device_stopped()
+
+    def _stream(self) -> None:
+        """Capture, process and send out frames until interrupted."""
         # initialize real camera, to get frames
         with self.device_handler.get_device() as r_cam:
             # custom setup for depthai (on device handling)
             if self.plugin.type == DEPTHAI:
                 r_cam.setup(self.plugin.device_setup, self.plugin.acquisition)
 
+            # pace the virtual camera like the real one, a slower pace would read frames queued up in the capture buffers
+            fps = 24
+            if self.plugin.type == WEBCAM:
+                fps = int(r_cam.get(cv2.CAP_PROP_FPS)) or fps
+
             # initialize a virtual camera where the modified frames will be sent to
             with pyvirtualcam.Camera(
                 width=r_cam.width,
                 height=r_cam.height,
-                fps=24,
+                fps=fps,
                 device=self.virtual_path,
+                # plugins work on bgr frames, the backend converts them to the device format anyway
+                fmt=pyvirtualcam.PixelFormat.BGR,
             ) as v_cam:
                 # initialize a keyboard keyhandler to get and use keystroke during runtime as trigger or switch
                 with self.plugin.keyhandler() as keyhandler:
@@ -74,25 +162,87 @@ class Runner:
                     # print in command line that the pipeline is running
                     self.device_handler.device_running()
 
-                    # get frames from real camera, process it and sent it out via virtual camera
-                    while True:
-                        # get a frame and optionally some on camera detections
-                        frame, detection = r_cam.get_frame()
-
-                        # convert bgr to rgb if <Ctrl>+<Alt>+r keys are pressed
-                        if keyhandler.bgr2rgb:
-                            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                    self._loop(r_cam, v_cam, keyhandler)
 
-                        frame = self.plugin.process(
-                            frame, detection, keyhandler
-                        )
-
-                        # flip image if <Ctrl>+<Alt>+m keys are pressed
-                        if keyhandler.mirror:
-                            frame = cv2.flip(frame, 1)
-
-                        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def _loop(
+        self,
+        r_cam: "VideoCapture | DepthaiCapture",
+        v_cam: pyvirtualcam.Camera,
+        keyhandler: KeyHandler,
+    ) -> None:
+        """Process frames, capturing and sending out frames in the background.
 
-                        # sent out the modified frame to the virtual camera
-                        v_cam.send(frame)
-                        v_cam.sleep_until_next_frame()
+        Args:
+            r_cam --- the real camera frames are captured from.
+            v_cam --- the virtual camera frames are sent to.
+            keyhandler --- the keyhandler with the current trigger and switch states.
+        """
+        # two sets of output buffers reused for every frame, opencv writes into them instead of allocating
+        # one set is written while the frame in the other one is still being sent
+        shape = (r_cam.height, r_cam.width, 3)
+        buffers = [
+            (np.empty(shape, dtype=np.uint8), np.empty(shape, dtype=np.uint8))
+            for _ in range(2)
+        ]
+        n = 0
+
+        # bound once, looked up on every frame otherwise
+        process = self.plugin.process
+        is_idle = self.plugin.is_idle
+        on_idle = self.plugin.on_idle
+        send = v_cam.send
+        sleep_until_next_frame = v_cam.sleep_until_next_frame
+        cvt_color = cv2.cvtColor
+        flip = cv2.flip
+        rgb2bgr = cv2.COLOR_RGB2BGR
+
+        def send_frame(frame: NDArray[Any]) -> None:
+            send(frame)
+            sleep_until_next_frame()
+
+        reader = FrameReader(r_cam.get_frame)
+        get_frame = reader.get
+        reader.start()
+
+        sending = None
+        idle = False
+        try:
+            with ThreadPoolExecutor(max_workers=1) as sender:
+                # get frames from real camera, process it and sent it out via virtual camera
+                while True:
+                    # get the latest frame and optionally some on camera detections
+                    frame, detection = get_frame()
+                    swap_buf, flip_buf = buffers[n]
+                    n ^= 1
+
+                    # convert bgr to rgb if <Ctrl>+<Alt>+r keys are pressed
+                    if keyhandler.bgr2rgb:
+                        frame = cvt_color(frame, rgb2bgr, dst=swap_buf)
+
+                    # skip plugin processing, e.g. inference, while it would not change the frame
+                    if not is_idle(keyhandler):
+                        frame = process(frame, detection, keyhandler)
+                        idle = False
+                    elif not idle:
+                        on_idle()
+                        idle = True
+
+                    # flip image if <Ctrl>+<Alt>+m keys are pressed
+                    if keyhandler.mirror:
+                        frame = flip(frame, 1, dst=flip_buf)
+
+                    # sent out the modified frame to the virtual camera, after the previous one to keep order and pacing
+                    if sending is not None:
+                        sending.result()
+                    sending = sender.submit(send_frame, frame)
+        finally:
+            # the camera is released after this, which must not happen while the reader still reads it
+            # kept open until confirmed, also if a second Ctrl-C interrupts the waiting
+            r_cam.keep_open = True
+            if reader.stop():
+                r_cam.keep_open = False
+            else:
+                print(
+                    "The camera does not respond, it is released when"
+                    " MeetingCam exits."
+                )
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# Post-training INT8 quantization of the face detection model of the
+# openvino_face_detection plugin, calibrated on frames of your own webcam.
+# Requires nncf: python -m pip install nncf
+
+import argparse
+from pathlib import Path
+
+import cv2
+import nncf
+import numpy as np
+from openvino.runtime import Core, serialize
+
+MODEL = "ultra-lightweight-face-detection-rfb-320"
+
+
+def preprocess(image):
+    # the raw model expects resized NCHW input, FaceDetector adds it on load
+    input_image = cv2.resize(image, dsize=[320, 240])
+    return np.expand_dims(input_image.transpose(2, 0, 1), axis=0)
+
+
+def main() -> None:
+    """Calibrate on webcam frames and save the INT8 model next to the FP16 one."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-d",
+        "--device",
+        default="/dev/video0",
+        help="webcam to calibrate with",
+    )
+    parser.add_argument(
+        "-n", "--frames", default=300, type=int, help="number of frames"
+    )
+    parser.add_argument(
+        "-m",
+        "--model-dir",
+        default="src/meetingcam/models",
+        help="directory the model was converted to",
+    )
+    args = parser.parse_args()
+
+    model_dir = Path(args.model_dir) / "public" / MODEL
+    fp16_path = model_dir / "FP16" / f"{MODEL}.xml"
+    int8_path = model_dir / "INT8" / f"{MODEL}.xml"
+
+    # collect calibration frames
+    capture = cv2.VideoCapture(args.device)
+    frames = []
+    while len(frames) < args.frames:
+        grabbed, frame = capture.read()
+        if not grabbed:
+            raise RuntimeError(f"Image acquisition from {args.device} failed.")
+        frames.append(frame)
+    capture.release()
+    print(f"Captured {len(frames)} calibration frames.")
+
+    model = Core().read_model(str(fp16_path))
+    quantized = nncf.quantize(
+        model,
+        nncf.Dataset(frames, preprocess),
+        preset=nncf.QuantizationPreset.PERFORMANCE,
+        subset_size=len(frames),
+    )
+
+    int8_path.parent.mkdir(parents=True, exist_ok=True)
+    serialize(quantized, str(int8_path))
+    print(f"Saved INT8 model to {int8_path}")
+
+
+if __name__ == "__main__":
+    main()